@@ -6,12 +6,15 @@ uk workflows
 from __future__ import annotations
 
 import asyncio
+import collections
 import dataclasses
 import functools
 import logging
 import mimetypes
 import sys
+import time
 import typing
+import weakref
 
 import aiofiles
 import aiohttp
@@ -40,6 +43,9 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# how many tenants keep their tokens warm in one process
+TOKEN_STATES_SIZE = 512
+
 
 # DONT DO KDA KOL MARA U NEED HAGA GET L LOOP TANI
 if sys.platform in ('win32'):
@@ -55,16 +61,173 @@ else:
         asyncio.set_event_loop(loop)
 
 
+# a connector only works on the loop it was made on, so one per loop
+_connectors: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    aiohttp.TCPConnector,
+] = weakref.WeakKeyDictionary()
+
+
+def _connector() -> aiohttp.TCPConnector:
+    """One connection pool & DNS cache for every Client on this loop."""
+    running = asyncio.get_running_loop()
+    connector = _connectors.get(running)
+    if connector is None or connector.closed:
+        connector = _connectors[running] = aiohttp.TCPConnector(
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+        )
+    return connector
+
+
+async def close() -> None:
+    """Close the connections of this loop, call it before the loop ends.
+
+    >>> fanella.loop.run_until_complete(fanella.close())
+    """
+    connector = _connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None:
+        await connector.close()
+
+
+@dataclasses.dataclass
+class _TokenState:
+    access_token: str = ""
+    refresh_token: str = ""
+    lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
+
+
+class _TokenStates(collections.OrderedDict[tuple[str, str], _TokenState]):
+    """LRU of tenant tokens so many Clients of one tenant auth once."""
+
+    def get_state(self, key: tuple[str, str]) -> _TokenState:
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        self[key] = state = _TokenState()
+        while len(self) > TOKEN_STATES_SIZE:
+            self.popitem(last=False)
+        return state
+
+
+# their locks are tied to a loop too
+_token_states: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    _TokenStates,
+] = weakref.WeakKeyDictionary()
+
+
+@dataclasses.dataclass
+class Hedge:
+    """Send a 2nd identical read when the 1st is slow, first answer wins.
+
+    Only for reads, waits ``delay`` seconds or the observed ``quantile`` of
+    this endpoint once it saw ``min_samples`` answers. At most ``max_rate``
+    of requests get hedged so our servers don't get double the load.
+    >>> Request('/sources/', hedge=fanella.Hedge(max_rate=0.05))
+    """
+
+    delay: float | None = None
+    quantile: float = 0.95
+    max_rate: float = 0.1
+    min_samples: int = 20
+    window: int = 200
+
+    # metrics
+    requests: int = dataclasses.field(default=0, init=False)
+    hedged: int = dataclasses.field(default=0, init=False)
+    wins: int = dataclasses.field(default=0, init=False)
+
+    _latencies: collections.deque[float] = dataclasses.field(
+        init=False,
+        repr=False,
+    )
+    # a bucket holding at most 1 hedge, so quiet times can't save up a burst
+    _budget: float = dataclasses.field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Keep only the last ``window`` latencies."""
+        if not (0 <= self.quantile <= 1 and 0 <= self.max_rate <= 1):
+            log.error('Hedge needs quantile and max_rate within 0..1')
+            raise _coder_bad
+        if not 0 < self.min_samples <= self.window:
+            log.error('Hedge needs 0 < min_samples <= window')
+            raise _coder_bad
+        self._latencies = collections.deque(maxlen=self.window)
+
+    def _delay(self) -> float | None:
+        if self.delay is not None:
+            return self.delay
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[int(self.quantile * (len(latencies) - 1))]
+
+    async def run[T](
+        self,
+        send: typing.Callable[[], typing.Awaitable[T]],
+    ) -> T:
+        """Await ``send()``, hedging it with a 2nd call if it's slow."""
+        self.requests += 1
+        self._budget = min(1, self._budget + self.max_rate)
+        first = asyncio.ensure_future(send())
+        # each try is timed from its own start, else hedges push p95 up
+        started = {first: time.monotonic()}
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self._delay())
+            if not done and self._budget >= 1:
+                self._budget -= 1
+                self.hedged += 1
+                log.debug(
+                    "hedging after %.3fs",
+                    time.monotonic() - started[first],
+                )
+                second = asyncio.ensure_future(send())
+                started[second] = time.monotonic()
+                pending.add(second)
+
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                # ask every task so no exception goes unretrieved
+                errors = {task: task.exception() for task in done}
+                for task, error in errors.items():
+                    if error is None:
+                        if task is not first:
+                            self.wins += 1
+                        self._latencies.append(
+                            time.monotonic() - started[task],
+                        )
+                        return task.result()
+            raise typing.cast(BaseException, error)
+        finally:
+            for task in pending:
+                task.cancel()
+
+
 @dataclasses.dataclass
 class Request[responseType]:
-    """Make a request to Fanella."""
+    """Make a request to Fanella.
+
+    Bound to ``_client``, or the only Client if you made one tenant.
+    """
 
     _resource: str
     _auth: bool = dataclasses.field(default=True, kw_only=True)
-    token_defn: typing.Callable[[Client], typing.Awaitable[str]] = dataclasses.field(
-        init=False,
+    _client: Client | None = dataclasses.field(
+        default=None,
+        kw_only=True,
         repr=False,
     )
+    hedge: Hedge | None = dataclasses.field(default=None, kw_only=True)
+
+    async def _token(self) -> str:
+        client = self._client or Client._unbound()
+        return await client._auth()
 
     async def _send(
         self,
@@ -74,13 +237,17 @@ class Request[responseType]:
         data: aiohttp.FormData | None = None,
     ) -> responseType:
         async with (
-            aiohttp.ClientSession() as session,
+            aiohttp.ClientSession(
+                connector=_connector(),
+                connector_owner=False,
+                cookie_jar=aiohttp.DummyCookieJar(),
+            ) as session,
             getattr(session, method)(
                 path,
                 json=json,
                 data=data,
                 headers=(
-                    {"Authorization": f"Bearer {await self.token_defn()}"}
+                    {"Authorization": f"Bearer {await self._token()}"}
                     if self._auth
                     else {}
                 ),
@@ -132,11 +299,15 @@ class Request[responseType]:
         ))['data']
 
     async def get(self, id_: int) -> responseType:
-        """Get data by id."""
-        return await self._send(
-            "post",
+        """Get data by id, hedged if the request has a ``hedge``."""
+        send = functools.partial(
+            self._send,
+            "get",
             BASE_URL + f"{self._resource}/{id_}",
         )
+        if self.hedge is None:
+            return await send()
+        return await self.hedge.run(send)
 
     async def delete(self, id_: int) -> responseType:
         """Get data by id."""
@@ -154,7 +325,11 @@ class Resource:
     uuid: pydantic.UUID4 = dataclasses.field(init=False)
     created_at: datetime.datetime = dataclasses.field(init=False)
 
-    #  _client: Client = dataclasses.field(kw_only=True, repr=False)
+    _client: Client | None = dataclasses.field(
+        default=None,
+        kw_only=True,
+        repr=False,
+    )
 
     @classmethod
     def from_(cls, data: dict) -> Resource:
@@ -168,16 +343,139 @@ class Resource:
         cls._request = Request[cls](cls.api_resource_path)
 
     @classmethod
-    def all(cls,page: int = 1, rows: int = 10):
+    def all(
+        cls,
+        page: int = 1,
+        rows: int = 10,
+        *,
+        adaptive: AdaptiveRows | None = None,
+        client: Client | None = None,
+    ):
+        """Yield your data page by page.
+
+        Pass ``adaptive`` to let the page size follow the server instead of
+        staying at ``rows``, and ``client`` to list another tenant's data.
+        """
         if not hasattr(cls, '_request'):
             cls.initialize_request()  # Ensure _request is initialized
+        request = cls._request
+        if client is not None:
+            request = dataclasses.replace(request, _client=client)
+        if adaptive is not None:
+            yield from cls._all_adaptive(request, (page - 1) * rows, adaptive)
+            return
         while True:
-            data = loop.run_until_complete( cls._request.get_all(page=page, rows=rows))
+            data = loop.run_until_complete(
+                request.get_all(page=page, rows=rows),
+            )
             if not data:
-                return 
+                return
             yield [cls.from_(d) for d in data]
             page+=1
 
+    @classmethod
+    def _all_adaptive(
+        cls,
+        request: Request,
+        offset: int,
+        adaptive: AdaptiveRows,
+    ):
+        """Walk by offset, the server only knows page*rows.
+
+        Sizes are ``min_rows`` * 2**n so a smaller one always divides the
+        offset a bigger one reached, that way no page is fetched twice.
+        """
+        while True:
+            rows = adaptive.aligned(offset)
+            started = time.monotonic()
+            try:
+                data = loop.run_until_complete(
+                    request.get_all(page=offset // rows + 1, rows=rows),
+                )
+            except (RuntimeError, aiohttp.ClientError, TimeoutError) as e:
+                # only our side failing is load, your 4xx won't get better
+                yours = isinstance(e, RuntimeError) and e is not _fanella_bad
+                if yours or not adaptive.failed(rows):
+                    raise
+                continue
+            if not data:
+                return
+            adaptive.observe(time.monotonic() - started, len(data))
+            if len(data) < rows:
+                # the server caps rows or it's the end, next page tells
+                adaptive.capped(len(data))
+            # only an unaligned start (or after a cap) drops a head
+            data = data[offset % rows:]
+            if not data and adaptive.rows == rows:
+                return
+            if data:
+                yield [cls.from_(d) for d in data]
+                offset += len(data)
+
+
+@dataclasses.dataclass
+class AdaptiveRows:
+    """Page size for ``Resource.all`` that tunes itself.
+
+    Grows or shrinks ``rows`` so a page takes about ``target_latency``
+    seconds, never leaving ``min_rows``..``max_rows``. Errors halve it.
+    Sizes are rounded down to ``min_rows`` * 2**n.
+    >>> list(Source.all(adaptive=fanella.AdaptiveRows(max_rows=640)))
+    """
+
+    rows: int = 40
+    min_rows: int = 10
+    max_rows: int = 1280
+    target_latency: float = 1.0
+    max_growth: float = 2.0
+
+    def __post_init__(self) -> None:
+        """Keep the starting size inside the bounds."""
+        if not 0 < self.min_rows <= self.max_rows:
+            log.error('AdaptiveRows needs 0 < min_rows <= max_rows')
+            raise _coder_bad
+        self.rows = self._clamp(self.rows)
+
+    def _clamp(self, rows: float) -> int:
+        size = self.min_rows
+        while size * 2 <= min(rows, self.max_rows):
+            size *= 2
+        return size
+
+    def observe(self, latency: float, count: int) -> None:
+        """Resize from how long ``count`` items took to arrive."""
+        if latency <= 0 or count <= 0:
+            return
+        wanted = self.target_latency * count / latency
+        self.rows = self._clamp(
+            min(wanted, self.rows * self.max_growth),
+        )
+
+    def aligned(self, offset: int) -> int:
+        """Biggest size up to ``rows`` that has a page starting at ``offset``.
+
+        If none does you get ``rows`` and the head of its page is dropped.
+        """
+        size = self.rows
+        while size >= self.min_rows:
+            if offset % size == 0:
+                return size
+            size //= 2
+        return self.rows
+
+    def capped(self, count: int) -> None:
+        """The server gave ``count`` when asked for more, don't ask again."""
+        self.max_rows = max(self.min_rows, count)
+        self.rows = self._clamp(self.rows)
+
+    def failed(self, rows: int) -> bool:
+        """Halve ``rows`` that failed, say if a retry is worth it."""
+        if rows <= self.min_rows:
+            return False
+        self.rows = self._clamp(rows // 2)
+        log.warning('page failed, retrying with rows=%s', self.rows)
+        return True
+
 
 @dataclasses.dataclass
 class OwnerMixin:
@@ -236,11 +534,42 @@ class Client:
     _access_token: str = dataclasses.field(default="", init=False, repr=False)
     _refresh_token: str = dataclasses.field(default="", init=False, repr=False)
 
+    # what requests without a client use, only while you made one tenant
+    _default: typing.ClassVar[Client | None] = None
+    _many_tenants: typing.ClassVar[bool] = False
+
     def __post_init__(self) -> None:
-        """Auth & prepare Fanella resources."""
-        loop.run_until_complete(self._auth())
-        #  self.Source = functools.partial(Source, _client=self)
-        Request.token_defn = self._auth
+        """Auth & prepare Fanella resources.
+
+        Inside a running loop you get the token on the first request.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop.run_until_complete(self._auth())
+        self.Source = functools.partial(Source, _client=self)
+        if Client._default is None:
+            Client._default = self
+        elif self._tenant() is None or (
+            self._tenant() != Client._default._tenant()
+        ):
+            Client._many_tenants = True
+
+    @classmethod
+    def _unbound(cls) -> Client:
+        if cls._many_tenants:
+            log.error("More than one tenant, pass client= or _client=")
+            raise _coder_bad
+        if cls._default is None:
+            log.error("Make a fanella.Client first")
+            raise _coder_bad
+        return cls._default
+
+    def _tenant(self) -> tuple[str, str] | None:
+        """Who you are, None for guests."""
+        if not all((self.client_id, self.client_secret)):
+            return None
+        return self.client_id, self.client_secret
 
     async def _auth(self) -> str:
         """Do whatever it takes to get you a token.
@@ -249,20 +578,40 @@ class Client:
         access or hack into our servers.
         """
         if not self._access_token:
-            data = aiohttp.FormData()
-            grant_type = "client_credentials"
-            if not all((self.client_id, self.client_id)):
+            tenant = self._tenant()
+            if tenant is None:
+                # every guest is its own tenant, nothing to share
                 grant_type = "guest"
-                log.warning("GUEST")
-
-            data.add_field("grant_type", grant_type)
-            data.add_field("client_id", self.client_id)
-            data.add_field("client_secret", self.client_secret)
-            self._access_token, self._refresh_token = (
-                await self._request.post(form=data)
-            ).values()
+                state = _TokenState()
+            else:
+                grant_type = "client_credentials"
+                states = _token_states.setdefault(
+                    asyncio.get_running_loop(),
+                    _TokenStates(),
+                )
+                state = states.get_state(tenant)
+            async with state.lock:
+                if not state.access_token:
+                    state.access_token, state.refresh_token = (
+                        await self._fetch_token(grant_type)
+                    )
+            self._access_token = state.access_token
+            self._refresh_token = state.refresh_token
         return self._access_token
 
+    async def _fetch_token(self, grant_type: str) -> tuple[str, str]:
+        data = aiohttp.FormData()
+        if grant_type == "guest":
+            log.warning("GUEST")
+
+        data.add_field("grant_type", grant_type)
+        data.add_field("client_id", self.client_id)
+        data.add_field("client_secret", self.client_secret)
+        access_token, refresh_token = (
+            await self._request.post(form=data)
+        ).values()
+        return access_token, refresh_token
+
 
 @dataclasses.dataclass
 class Source(OwnerMixin, BackgroundTaskMixin, ArchiveMixin, Resource):
@@ -292,6 +641,7 @@ class Source(OwnerMixin, BackgroundTaskMixin, ArchiveMixin, Resource):
 
     def __post_init__(self) -> None:
         """Set equest manager and upload source."""
+        self._request._client = self._client
         data = aiohttp.FormData()
 
         if not (
@@ -1,12 +1,24 @@
 """Pytests for Fanella."""
 
+import asyncio
+import itertools
 import os
 import tempfile
+import weakref
 from unittest.mock import AsyncMock
 
 import pytest
 
-from fanella import Client, Request, Source, _coder_bad, _fanella_bad
+import fanella
+from fanella import (
+    AdaptiveRows,
+    Client,
+    Hedge,
+    Request,
+    Source,
+    _coder_bad,
+    _fanella_bad,
+)
 
 
 @pytest.fixture
@@ -35,6 +47,12 @@ def mock_response(mocker) -> None:
     return mock_response
 
 
+@pytest.fixture
+def mock_token_client(mocker) -> None:
+    """Fixture for a Client that hands out a test token."""
+    return mocker.Mock(_auth=AsyncMock(return_value='test_token'))
+
+
 class TestRequest:
     """Tests for the Request class."""
 
@@ -44,11 +62,11 @@ class TestRequest:
         mocker,
         mock_aiohttp_session,
         mock_response,
+        mock_token_client,
     ) -> None:
         """Test successful _send method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
         result = await request._send('get', 'http://example.com/test')
 
         assert result == {'key': 'value'}
@@ -62,12 +80,12 @@ class TestRequest:
         mocker,
         mock_aiohttp_session,
         mock_response,
+        mock_token_client,
     ) -> None:
         """Test _send method with Fanella error (5xx)."""
         mock_response.status = 500
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         with pytest.raises(_fanella_bad):
             await request._send('get', 'http://example.com/test')
@@ -78,13 +96,13 @@ class TestRequest:
         mocker,
         mock_aiohttp_session,
         mock_response,
+        mock_token_client,
     ) -> None:
         """Test _send method with coder error (4xx)."""
         mock_response.status = 400
         mock_response.json.return_value = {'error': 'Bad Request'}
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         with pytest.raises(_coder_bad) as exc_info:
             await request._send('get', 'http://example.com/test')
@@ -92,12 +110,11 @@ class TestRequest:
 
     @pytest.mark.asyncio
     async def test_post(
-        self, mocker, mock_aiohttp_session, mock_response
+        self, mocker, mock_aiohttp_session, mock_response, mock_token_client
     ) -> None:
         """Test post method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         await request.post(json={'data': 'test'})
 
@@ -107,12 +124,11 @@ class TestRequest:
 
     @pytest.mark.asyncio
     async def test_patch(
-        self, mocker, mock_aiohttp_session, mock_response
+        self, mocker, mock_aiohttp_session, mock_response, mock_token_client
     ) -> None:
         """Test patch method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         await request.patch(1, json={'data': 'test'})
 
@@ -122,12 +138,11 @@ class TestRequest:
 
     @pytest.mark.asyncio
     async def test_get_all(
-        self, mocker, mock_aiohttp_session, mock_response
+        self, mocker, mock_aiohttp_session, mock_response, mock_token_client
     ) -> None:
         """Test get_all method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         await request.get_all(page=2, rows=20)
 
@@ -137,27 +152,25 @@ class TestRequest:
 
     @pytest.mark.asyncio
     async def test_get(
-        self, mocker, mock_aiohttp_session, mock_response
+        self, mocker, mock_aiohttp_session, mock_response, mock_token_client
     ) -> None:
         """Test get method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         await request.get(1)
 
-        mock_aiohttp_session.getattr.assert_called_once_with('post')
+        mock_aiohttp_session.getattr.assert_called_once_with('get')
         mock_aiohttp_session.getattr.return_value.return_value.__aenter__.assert_called_once()
         mock_aiohttp_session.getattr.return_value.return_value.__aexit__.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_delete(
-        self, mocker, mock_aiohttp_session, mock_response
+        self, mocker, mock_aiohttp_session, mock_response, mock_token_client
     ) -> None:
         """Test delete method."""
         mock_aiohttp_session.getattr.return_value.return_value = mock_response
-        request = Request[dict]('/test')
-        request.token_defn = AsyncMock(return_value='test_token')
+        request = Request[dict]('/test', _client=mock_token_client)
 
         await request.delete(1)
 
@@ -203,6 +216,83 @@ class TestClient:
         assert client._refresh_token == 'guest_refresh_token'
         mock_aiohttp_session.post.assert_called_once()
 
+    def test_auth_shared_per_tenant(self, mocker) -> None:
+        """Test clients of one tenant share a token, other tenants don't."""
+
+        async def fetch(client: Client, _: str) -> tuple[str, str]:
+            return client.client_id, 'refresh'
+
+        fetch = mocker.patch.object(
+            Client,
+            '_fetch_token',
+            autospec=True,
+            side_effect=fetch,
+        )
+        mocker.patch.object(
+            fanella,
+            '_token_states',
+            weakref.WeakKeyDictionary(),
+        )
+        mocker.patch.object(Client, '_default', None)
+        mocker.patch.object(Client, '_many_tenants', False)
+        first = Client(client_id='tenant_a', client_secret='s')
+        second = Client(client_id='tenant_a', client_secret='s')
+        other = Client(client_id='tenant_b', client_secret='s')
+
+        assert first._access_token == second._access_token == 'tenant_a'
+        assert other._access_token == 'tenant_b'
+        tenants = [call.args[0].client_id for call in fetch.await_args_list]
+        assert tenants.count('tenant_a') == 1
+        assert Client._many_tenants
+
+    @pytest.mark.asyncio
+    async def test_client_in_running_loop(self, mocker) -> None:
+        """Test a Client made inside a loop auths on the first request."""
+        fetch = mocker.patch.object(
+            Client,
+            '_fetch_token',
+            AsyncMock(return_value=('token', 'refresh')),
+        )
+        mocker.patch.object(Client, '_default', None)
+        client = Client(client_id='tenant', client_secret='s')
+        fetch.assert_not_awaited()
+
+        assert await Request[dict]('/test', _client=client)._token() == 'token'
+
+    def test_token_states_bounded(self, mocker) -> None:
+        """Test the token LRU drops the least recently used tenant."""
+        mocker.patch.object(fanella, 'TOKEN_STATES_SIZE', 2)
+        states = fanella._TokenStates()
+        states.get_state(('a', 's'))
+        states.get_state(('b', 's'))
+        states.get_state(('a', 's'))
+        states.get_state(('c', 's'))
+
+        assert list(states) == [('a', 's'), ('c', 's')]
+
+    @pytest.mark.asyncio
+    async def test_request_bound_to_client(self, mocker) -> None:
+        """Test a request uses its own client over the only tenant."""
+        bound = mocker.Mock(_auth=AsyncMock(return_value='bound'))
+        other = mocker.Mock(_auth=AsyncMock(return_value='other'))
+        mocker.patch.object(Client, '_default', other)
+        mocker.patch.object(Client, '_many_tenants', False)
+
+        assert await Request[dict]('/test', _client=bound)._token() == 'bound'
+        assert await Request[dict]('/test')._token() == 'other'
+
+    @pytest.mark.asyncio
+    async def test_unbound_request_many_tenants(self, mocker) -> None:
+        """Test an unbound request refuses to pick one of many tenants."""
+        other = mocker.Mock(_auth=AsyncMock(return_value='other'))
+        mocker.patch.object(Client, '_default', other)
+        mocker.patch.object(Client, '_many_tenants', True)
+
+        with pytest.raises(RuntimeError) as exc_info:
+            await Request[dict]('/test')._token()
+        assert exc_info.value is _coder_bad
+        other._auth.assert_not_awaited()
+
 
 class TestSource:
     """Tests for the Source class."""
@@ -322,3 +412,220 @@ class TestSource:
         assert result == (file_path, b'Test file content')
 
         os.remove(file_path)  # Clean up the temporary file
+
+
+class TestAdaptiveRows:
+    """Tests for the AdaptiveRows page sizer."""
+
+    @staticmethod
+    def walk(mocker, get_all, **kwargs) -> list[int]:
+        """List ids through Source.all with a fake get_all."""
+        request = mocker.Mock()
+        request.get_all = get_all
+        mocker.patch.object(Source, '_request', request, create=True)
+        mocker.patch(
+            'fanella.time.monotonic',
+            side_effect=itertools.cycle([0, 0.1]),
+        )
+        return [
+            source.id for page in Source.all(**kwargs) for source in page
+        ]
+
+    def test_grows_when_fast(self) -> None:
+        """Test rows grow but not more than max_growth per page."""
+        sizer = AdaptiveRows(rows=40, target_latency=1.0)
+        sizer.observe(0.1, 40)
+        assert sizer.rows == 80
+
+    def test_shrinks_when_slow(self) -> None:
+        """Test rows shrink towards the target latency."""
+        sizer = AdaptiveRows(rows=160, target_latency=1.0)
+        sizer.observe(4.0, 160)
+        assert sizer.rows == 40
+
+    def test_stays_in_bounds(self) -> None:
+        """Test rows never leave min_rows..max_rows."""
+        sizer = AdaptiveRows(rows=5000, min_rows=10, max_rows=200)
+        assert sizer.rows == 160
+        sizer.observe(100.0, 160)
+        assert sizer.rows == 10
+
+    def test_failed_halves_then_gives_up(self) -> None:
+        """Test errors halve the failed rows until min_rows."""
+        sizer = AdaptiveRows(rows=40, min_rows=10)
+        assert sizer.failed(40)
+        assert sizer.rows == 20
+        assert sizer.failed(20)
+        assert not sizer.failed(10)
+
+    def test_bad_bounds(self) -> None:
+        """Test min_rows must be positive and below max_rows."""
+        with pytest.raises(RuntimeError):
+            AdaptiveRows(min_rows=100, max_rows=10)
+
+    def test_all_no_skip_no_duplicate(self, mocker) -> None:
+        """Test changing rows mid iteration keeps every item once."""
+        items = [{'id': i} for i in range(95)]
+
+        async def get_all(*, page: int, rows: int) -> list[dict]:
+            return items[(page - 1) * rows:page * rows]
+
+        sizer = AdaptiveRows(rows=10, min_rows=5, max_rows=40)
+        seen = self.walk(mocker, get_all, rows=10, adaptive=sizer)
+        assert seen == list(range(95))
+
+    def test_all_never_refetches(self, mocker) -> None:
+        """Test growing rows keeps pages aligned, nothing is fetched twice."""
+        items = [{'id': i} for i in range(300)]
+        fetched = []
+
+        async def get_all(*, page: int, rows: int) -> list[dict]:
+            data = items[(page - 1) * rows:page * rows]
+            fetched.extend(d['id'] for d in data)
+            return data
+
+        sizer = AdaptiveRows(rows=40, min_rows=10, max_rows=640)
+        seen = self.walk(mocker, get_all, rows=40, adaptive=sizer)
+        assert seen == list(range(300))
+        assert len(fetched) == len(set(fetched))
+
+    def test_all_retries_server_errors(self, mocker) -> None:
+        """Test a 5xx shrinks rows and retries without skipping items."""
+        items = [{'id': i} for i in range(60)]
+        calls = []
+
+        async def get_all(*, page: int, rows: int) -> list[dict]:
+            calls.append((page, rows))
+            if len(calls) == 2:
+                raise _fanella_bad
+            return items[(page - 1) * rows:page * rows]
+
+        sizer = AdaptiveRows(rows=20, min_rows=5, max_rows=20)
+        seen = self.walk(mocker, get_all, rows=20, adaptive=sizer)
+        assert seen == list(range(60))
+        assert calls[:3] == [(1, 20), (2, 20), (3, 10)]
+
+    def test_all_retry_shrinks_unaligned(self, mocker) -> None:
+        """Test a retry shrinks even if no smaller size divides offset."""
+        items = [{'id': i} for i in range(100)]
+        calls = []
+
+        async def get_all(*, page: int, rows: int) -> list[dict]:
+            calls.append((page, rows))
+            if len(calls) == 1:
+                raise _fanella_bad
+            return items[(page - 1) * rows:page * rows]
+
+        sizer = AdaptiveRows(rows=40, min_rows=10, max_rows=40)
+        seen = self.walk(
+            mocker, get_all, page=2, rows=37, adaptive=sizer,
+        )
+        assert seen == list(range(37, 100))
+        assert calls[:2] == [(1, 40), (2, 20)]
+
+    def test_all_server_cap(self, mocker) -> None:
+        """Test a server capping rows doesn't end the listing early."""
+        items = [{'id': i} for i in range(2000)]
+
+        async def get_all(*, page: int, rows: int) -> list[dict]:
+            start = (page - 1) * rows
+            return items[start:start + min(rows, 100)]
+
+        sizer = AdaptiveRows(rows=80, min_rows=10, max_rows=1280)
+        seen = self.walk(mocker, get_all, rows=80, adaptive=sizer)
+        assert seen == list(range(2000))
+        assert sizer.max_rows == 100
+
+    def test_all_user_error_not_retried(self, mocker) -> None:
+        """Test a 4xx goes straight to you without shrinking rows."""
+        get_all = AsyncMock(side_effect=_coder_bad)
+        sizer = AdaptiveRows(rows=40, min_rows=10)
+
+        with pytest.raises(RuntimeError) as exc_info:
+            self.walk(mocker, get_all, adaptive=sizer)
+        assert exc_info.value is _coder_bad
+        assert sizer.rows == 40
+        get_all.assert_awaited_once()
+
+
+class TestHedge:
+    """Tests for hedged reads."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins(self) -> None:
+        """Test a slow first request loses to the hedge."""
+        delays = iter([1.0, 0.01])
+
+        async def send() -> str:
+            await asyncio.sleep(next(delays))
+            return 'data'
+
+        hedge = Hedge(delay=0.05, max_rate=1)
+        assert await hedge.run(send) == 'data'
+        assert (hedge.requests, hedge.hedged, hedge.wins) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_hedge_rate_capped(self) -> None:
+        """Test no hedge fires past max_rate."""
+
+        async def send() -> str:
+            await asyncio.sleep(0.05)
+            return 'data'
+
+        hedge = Hedge(delay=0.01, max_rate=0)
+        assert await hedge.run(send) == 'data'
+        assert hedge.hedged == 0
+
+    def test_hedge_waits_for_samples(self) -> None:
+        """Test the p95 delay is only used after min_samples answers."""
+        hedge = Hedge(min_samples=2)
+        assert hedge._delay() is None
+        hedge._latencies.extend([0.1, 0.2])
+        assert hedge._delay() == 0.1
+
+    @pytest.mark.asyncio
+    async def test_get_hedged(self, mocker) -> None:
+        """Test both the first and the hedged get are the same GET."""
+        delays = iter([1.0, 0.01])
+
+        async def send(*_) -> dict:
+            await asyncio.sleep(next(delays))
+            return {'id': 1}
+
+        request = Request[dict]('/test', hedge=Hedge(delay=0.05, max_rate=1))
+        mocker.patch.object(request, '_send', AsyncMock(side_effect=send))
+
+        assert await request.get(1) == {'id': 1}
+        assert request._send.await_args_list == [
+            mocker.call('get', fanella.BASE_URL + '/test/1'),
+        ] * 2
+        assert request.hedge.wins == 1
+
+    def test_hedge_validates(self) -> None:
+        """Test settings that would never hedge are refused."""
+        with pytest.raises(RuntimeError):
+            Hedge(quantile=1.5)
+        with pytest.raises(RuntimeError):
+            Hedge(max_rate=-0.1)
+        with pytest.raises(RuntimeError):
+            Hedge(window=0)
+        with pytest.raises(RuntimeError):
+            Hedge(min_samples=50, window=10)
+
+    @pytest.mark.asyncio
+    async def test_hedge_rate_after_quiet(self) -> None:
+        """Test a slowdown after many fast requests hedges ~max_rate."""
+        delay = 0.0
+
+        async def send() -> str:
+            await asyncio.sleep(delay)
+            return 'data'
+
+        hedge = Hedge(delay=0.01, max_rate=0.1)
+        for _ in range(200):
+            await hedge.run(send)
+        delay = 0.03
+        for _ in range(20):
+            await hedge.run(send)
+
+        assert hedge.hedged <= 3